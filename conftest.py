@@ -72,3 +72,23 @@ def mock_ensure_client(mock_homey_client):
     """Mock the ensure_client function to return our test client."""
     with patch('homey_mcp.client.manager.ensure_client', return_value=mock_homey_client):
         yield mock_homey_client
+
+
+@pytest.fixture(scope="session")
+def registered_modules():
+    """Register all tools once per session and share the resulting module tuple."""
+    from homey_mcp.tools import register_all_tools
+
+    return register_all_tools()
+
+
+@pytest.fixture(scope="session")
+def main_module():
+    """Import the server entry point once per session, reusing an earlier import."""
+    import importlib
+
+    with patch.dict(
+        os.environ,
+        {"HOMEY_API_URL": "http://test.local", "HOMEY_API_TOKEN": "test_token"},
+    ):
+        return importlib.import_module("main")
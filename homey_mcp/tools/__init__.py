@@ -1,29 +1,36 @@
 """Tools module for HomeyPro MCP Server."""
 
+from functools import cache
+
 from ..utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-def register_all_tools():
-    """Register all MCP tools, prompts, and resources by importing the modules."""
-    imported_modules = []
-    
-    logger.info("Registering all tool modules")
-    
+@cache
+def _import_tool_modules():
+    """Import all tool, prompt, and resource modules once and return them."""
     # Import all tool modules to register their @mcp.tool() decorators
     from . import devices, flows, zones, system
-    imported_modules.extend([devices, flows, zones, system])
     logger.debug("Imported device, flow, zone, and system tools")
-    
+
     # Always import prompt and resource modules
     from . import prompts, resources
-    imported_modules.extend([prompts, resources])
     logger.debug("Imported prompts and resources")
-    
+
+    return (devices, flows, zones, system, prompts, resources)
+
+
+def register_all_tools():
+    """Register all MCP tools, prompts, and resources by importing the modules."""
+    logger.info("Registering all tool modules")
+
+    # Module imports are cached, so repeated calls return the same tuple
+    imported_modules = _import_tool_modules()
+
     # Configure optional tools based on environment variables
     from ..utils.tool_config import configure_optional_tools
     configure_optional_tools()
-    
+
     # Return tuple of imported modules for reference if needed
-    return tuple(imported_modules)
+    return imported_modules
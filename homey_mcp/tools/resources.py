@@ -1,8 +1,8 @@
 """Resource-related tools for HomeyPro MCP Server."""
 
 import time
-from dataclasses import dataclass
-from typing import Any, Callable, Dict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
 
 from ..client.manager import ensure_client
 from ..config import get_config
@@ -13,16 +13,22 @@ from ..exceptions import HomeyConnectionError, HomeyTimeoutError
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheEntry:
-    """Cache entry with timestamp and TTL tracking."""
+    """Cache entry with monotonic timestamp and TTL tracking."""
     data: Any
     timestamp: float
     ttl: float
+    expires_at: float = field(init=False)
     
-    def is_expired(self) -> bool:
-        """Check if the cache entry has expired."""
-        return time.time() > (self.timestamp + self.ttl)
+    def __post_init__(self):
+        self.expires_at = self.timestamp + self.ttl
+    
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Check if the cache entry has expired at monotonic time ``now``."""
+        if now is None:
+            now = time.monotonic()
+        return now > self.expires_at
 
 
 class SimpleCache:
@@ -46,10 +52,12 @@ class SimpleCache:
         Raises:
             Exception: If fetcher fails and no stale data is available
         """
+        # Entries are stamped and checked against the same monotonic clock
+        now = time.monotonic()
         entry = self._cache.get(key)
         
         # Return fresh cache data if available and not expired
-        if entry and not entry.is_expired():
+        if entry and not entry.is_expired(now):
             logger.debug(f"Cache hit for key: {key}")
             return entry.data
             
@@ -57,7 +65,11 @@ class SimpleCache:
         try:
             logger.debug(f"Cache miss or expired for key: {key}, fetching fresh data")
             data = await fetcher()
-            self._cache[key] = CacheEntry(data, time.time(), ttl)
+            # Stamp after the fetch so its latency doesn't eat into the TTL
+            fetched_at = time.monotonic()
+            # Store a new entry rather than mutating the old one, which a concurrent
+            # caller may still be holding as its stale fallback
+            self._cache[key] = CacheEntry(data, fetched_at, ttl)
             logger.debug(f"Successfully cached fresh data for key: {key}")
             return data
         except (ConnectionError, HomeyConnectionError) as e:
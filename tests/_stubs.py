@@ -0,0 +1,60 @@
+"""Hand-written async stubs standing in for the Homey client in the flow tests."""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class FakeFlows:
+    """Flow manager stub that records every call as a (method, *args) tuple.
+
+    Lookups are served from the flows/advanced_flows dicts, triggers return
+    the value in results, and an exception placed in errors under a method
+    name is raised by that method instead.
+    """
+
+    flows: dict[str, Any] = field(default_factory=dict)
+    advanced_flows: dict[str, Any] = field(default_factory=dict)
+    results: dict[str, Any] = field(
+        default_factory=lambda: {"trigger_flow": True, "trigger_advanced_flow": True}
+    )
+    errors: dict[str, BaseException] = field(default_factory=dict)
+    calls: list[tuple] = field(default_factory=list)
+
+    def _record(self, name: str, *args: Any) -> None:
+        """Record a call and raise the error configured for it, if any."""
+        self.calls.append((name, *args))
+        error = self.errors.get(name)
+        if error is not None:
+            raise error
+
+    async def get_flows(self) -> list[Any]:
+        self._record("get_flows")
+        return list(self.flows.values())
+
+    async def get_advanced_flows(self) -> list[Any]:
+        self._record("get_advanced_flows")
+        return list(self.advanced_flows.values())
+
+    async def get_flow(self, flow_id: str) -> Any:
+        self._record("get_flow", flow_id)
+        return self.flows.get(flow_id)
+
+    async def get_advanced_flow(self, flow_id: str) -> Any:
+        self._record("get_advanced_flow", flow_id)
+        return self.advanced_flows.get(flow_id)
+
+    async def trigger_flow(self, flow_id: str) -> Any:
+        self._record("trigger_flow", flow_id)
+        return self.results["trigger_flow"]
+
+    async def trigger_advanced_flow(self, flow_id: str) -> Any:
+        self._record("trigger_advanced_flow", flow_id)
+        return self.results["trigger_advanced_flow"]
+
+
+@dataclass
+class FakeClient:
+    """Client stub exposing only a FakeFlows manager."""
+
+    flows: FakeFlows = field(default_factory=FakeFlows)
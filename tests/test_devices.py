@@ -1,12 +1,8 @@
 """Unit tests for device functionality."""
 
 import pytest
-import pytest_asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
-# Configure pytest-asyncio
-pytest_asyncio.auto_mode = True
-
 import homey_mcp.tools.devices as devices_module
 from homey_mcp.utils.pagination import PaginationError
 
@@ -1,12 +1,8 @@
 """Unit tests for flow functionality."""
 
 import pytest
-import pytest_asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
-# Configure pytest-asyncio
-pytest_asyncio.auto_mode = True
-
 import homey_mcp.tools.flows as flows_module
 
 
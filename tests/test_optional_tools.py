@@ -1,8 +1,11 @@
 """Tests for optional tools functionality."""
 
+import importlib
 import os
 from unittest.mock import patch, MagicMock
 
+import pytest
+
 from homey_mcp.utils.tool_config import configure_optional_tools, _disable_tool, TOOL_FUNCTIONS
 
 
@@ -204,6 +207,22 @@ class TestToolFunctionsConstant:
 class TestIntegrationWithToolRegistration:
     """Integration tests with actual tool registration."""
 
+    @pytest.fixture(autouse=True)
+    def restore_tool_state(self):
+        """Restore every tool's enabled flag, since register_all_tools() disables the global tools."""
+        tools = [
+            getattr(importlib.import_module(f"homey_mcp.tools.{module_name}"), tool_name)
+            for module_name, tool_names in TOOL_FUNCTIONS.items()
+            for tool_name in tool_names
+        ]
+        enabled = [tool.enabled for tool in tools]
+        yield
+        for tool, was_enabled in zip(tools, enabled):
+            if was_enabled:
+                tool.enable()
+            else:
+                tool.disable()
+
     def setup_method(self):
         """Set up test environment."""
         # Clear any existing environment variables
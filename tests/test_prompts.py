@@ -1,18 +1,219 @@
 """Unit tests for prompt functionality."""
 
+import typing
+
 import pytest
-import pytest_asyncio
+from types import SimpleNamespace as NS
 from unittest.mock import AsyncMock, MagicMock, patch
 
-# Configure pytest-asyncio
-pytest_asyncio.auto_mode = True
-
-import homey_mcp.tools.prompts as prompts_module
 from homey_mcp.tools.prompts import (
     PromptContext,
+    device_capability_explorer,
+    device_control_assistant,
+    device_troubleshooting,
+    flow_creation_assistant,
+    flow_debugging,
+    flow_optimization,
     get_prompt_context,
+    system_health_check,
+    zone_organization,
+)
+
+_CTX_DEVICE_CONTROL_OK = PromptContext(
+    system_info={"connection_status": "connected"},
+    device_summary={
+        "total_count": 10,
+        "online_count": 8,
+        "offline_count": 2,
+        "device_type_count": 3,
+        "capability_count": 15,
+        "sample_device_types": ("light", "sensor", "thermostat")
+    },
+    zone_summary={"total_count": 4, "zone_names": ("Living Room", "Kitchen", "Bedroom", "Bathroom")},
+    flow_summary={"total_count": 5, "enabled_count": 4},
+    timestamp="2024-01-01T12:00:00",
+)
+
+_CTX_TROUBLESHOOT_OK = PromptContext(
+    system_info={"connection_status": "connected"},
+    device_summary={"total_count": 10, "online_count": 9, "offline_count": 1},
+    zone_summary={"total_count": 3, "zone_names": ("Living Room", "Kitchen", "Bedroom")},
+    flow_summary={"total_count": 5, "enabled_count": 4},
+    timestamp="2024-01-01T12:00:00",
 )
 
+_CTX_TROUBLESHOOT_CRITICAL = PromptContext(
+    system_info={"connection_status": "connected"},
+    device_summary={"total_count": 10, "online_count": 5, "offline_count": 5},
+    zone_summary={"total_count": 3, "zone_names": ("Living Room",)},
+    flow_summary={"total_count": 2, "enabled_count": 1},
+    timestamp="2024-01-01T12:00:00",
+)
+
+_CTX_CAPABILITY_EXPLORER_OK = PromptContext(
+    system_info={"connection_status": "connected"},
+    device_summary={
+        "total_count": 15,
+        "device_type_count": 5,
+        "capability_count": 25,
+        "sample_device_types": ("light", "sensor", "thermostat", "speaker")
+    },
+    zone_summary={"total_count": 4, "zone_names": ("Living Room", "Kitchen")},
+    flow_summary={"total_count": 3, "enabled_count": 2},
+    timestamp="2024-01-01T12:00:00",
+)
+
+_CTX_FLOW_CREATION_OK = PromptContext(
+    system_info={"connection_status": "connected"},
+    device_summary={
+        "total_count": 12,
+        "online_count": 11,
+        "sample_device_types": ("light", "motion_sensor", "thermostat")
+    },
+    zone_summary={"total_count": 3, "zone_names": ("Living Room", "Kitchen", "Bedroom")},
+    flow_summary={"total_count": 8, "enabled_count": 6},
+    timestamp="2024-01-01T12:00:00",
+)
+
+_CTX_FLOW_OPTIMIZATION_OK = PromptContext(
+    system_info={"connection_status": "connected"},
+    device_summary={"total_count": 20, "online_count": 18},
+    zone_summary={"total_count": 5, "zone_names": ("Living Room", "Kitchen")},
+    flow_summary={"total_count": 15, "enabled_count": 12},
+    timestamp="2024-01-01T12:00:00",
+)
+
+_CTX_FLOW_DEBUGGING_OK = PromptContext(
+    system_info={"connection_status": "connected"},
+    device_summary={"total_count": 10, "online_count": 9},
+    zone_summary={"total_count": 3, "zone_names": ("Living Room",)},
+    flow_summary={"total_count": 8, "enabled_count": 6},
+    timestamp="2024-01-01T12:00:00",
+)
+
+_CTX_SYSTEM_HEALTH_OK = PromptContext(
+    system_info={
+        "connection_status": "connected",
+        "address": "192.168.1.100",
+        "language": "en",
+        "units": "metric"
+    },
+    device_summary={"total_count": 25, "online_count": 23, "offline_count": 2},
+    zone_summary={"total_count": 6, "zone_names": ("Living Room", "Kitchen")},
+    flow_summary={"total_count": 12, "enabled_count": 10},
+    timestamp="2024-01-01T12:00:00",
+)
+
+_CTX_ZONE_ORGANIZATION_OK = PromptContext(
+    system_info={"connection_status": "connected"},
+    device_summary={"total_count": 30, "online_count": 28},
+    zone_summary={
+        "total_count": 8,
+        "zone_names": ("Living Room", "Kitchen", "Bedroom", "Bathroom", "Office", "Garage")
+    },
+    flow_summary={"total_count": 15, "enabled_count": 12},
+    timestamp="2024-01-01T12:00:00",
+)
+
+ALL_PROMPT_FNS = (
+    device_control_assistant.fn,
+    device_troubleshooting.fn,
+    device_capability_explorer.fn,
+    flow_creation_assistant.fn,
+    flow_optimization.fn,
+    flow_debugging.fn,
+    system_health_check.fn,
+    zone_organization.fn,
+)
+
+EXPECTED_DEVICE_CONTROL = (
+    "HomeyPro Device Control Assistant",
+    "**Total Devices**: 10",
+    "**Online Devices**: 8",
+    "**Offline Devices**: 2",
+    "light, sensor, thermostat",
+    "Living Room, Kitchen, Bedroom, Bathroom",
+    "2024-01-01T12:00:00",
+)
+
+EXPECTED_TROUBLESHOOTING = (
+    "HomeyPro Device Troubleshooting Guide",
+    "Good (90.0% devices online)",  # 9/10 = 90%
+    "**Total Devices**: 10",
+    "**Online Devices**: 9",
+    "**Offline Devices**: 1",
+    "1 currently offline",
+)
+
+EXPECTED_CAPABILITY_EXPLORER = (
+    "HomeyPro Device Capability Explorer",
+    "**Total Devices**: 15",
+    "**Device Types**: 5 different types",
+    "**Unique Capabilities**: 25 available",
+    "light, sensor, thermostat, speaker",
+    "Living Room, Kitchen",
+)
+
+EXPECTED_FLOW_CREATION = (
+    "HomeyPro Flow Creation Assistant",
+    "**Total Devices**: 12 (11 online)",
+    "**Available Zones**: 3 zones",
+    "**Existing Flows**: 8 (6 enabled)",
+    "light, motion_sensor, thermostat",
+    "- Living Room",
+    "- Kitchen",
+    "- Bedroom",
+)
+
+EXPECTED_FLOW_OPTIMIZATION = (
+    "HomeyPro Flow Optimization Guide",
+    "**Total Flows**: 15",
+    "**Enabled Flows**: 12",
+    "**Disabled Flows**: 0",  # The actual output shows 0, not 3
+    "**System Devices**: 20",
+)
+
+EXPECTED_FLOW_DEBUGGING = (
+    "HomeyPro Flow Debugging Guide",
+    "6/8 flows enabled",
+    "Device Health**: 90.0%",
+    "9/10 devices online",
+)
+
+EXPECTED_SYSTEM_HEALTH = (
+    "HomeyPro System Health Check",
+    "🟡 Good",  # 23/25 = 92%
+    "**Total Devices**: 25",
+    "**Online Devices**: 23",
+    "**Offline Devices**: 2",
+    "192.168.1.100",
+)
+
+EXPECTED_ZONE_ORGANIZATION = (
+    "HomeyPro Zone Organization Guide",
+    "**Total Zones**: 8",
+    "**Total Devices**: 30",
+    "Living Room",
+    "Kitchen",
+    "Bedroom",
+)
+
+
+@pytest.fixture(scope="module")
+def _ensure_client_patch():
+    """Patch ensure_client once for the whole module."""
+    patcher = patch('homey_mcp.tools.prompts.ensure_client')
+    mock = patcher.start()
+    yield mock
+    patcher.stop()
+
+
+@pytest.fixture
+def ensure_client_mock(_ensure_client_patch):
+    """Provide the shared ensure_client mock, reset after each test."""
+    yield _ensure_client_patch
+    _ensure_client_patch.reset_mock(return_value=True, side_effect=True)
+
 
 class TestPromptContext:
     """Test PromptContext data class."""
@@ -54,23 +255,22 @@ class TestGetPromptContext:
         client = AsyncMock()
         
         # Mock devices
-        mock_device1 = MagicMock()
-        mock_device1.is_online.return_value = True
-        mock_device1.class_ = "light"
-        mock_device1.capabilities = {"onoff": True, "dim": 0.5}
-        
-        mock_device2 = MagicMock()
-        mock_device2.is_online.return_value = False
-        mock_device2.class_ = "sensor"
-        mock_device2.capabilities = {"measure_temperature": 22.5}
+        mock_device1 = NS(
+            is_online=lambda: True,
+            class_="light",
+            capabilities={"onoff": True, "dim": 0.5},
+        )
+        mock_device2 = NS(
+            is_online=lambda: False,
+            class_="sensor",
+            capabilities={"measure_temperature": 22.5},
+        )
         
         client.devices.get_devices.return_value = [mock_device1, mock_device2]
         
         # Mock zones
-        mock_zone1 = MagicMock()
-        mock_zone1.name = "Living Room"
-        mock_zone2 = MagicMock()
-        mock_zone2.name = "Kitchen"
+        mock_zone1 = NS(name="Living Room")
+        mock_zone2 = NS(name="Kitchen")
         
         client.zones.get_zones.return_value = [mock_zone1, mock_zone2]
         
@@ -81,21 +281,21 @@ class TestGetPromptContext:
         client.flows.get_enabled_advanced_flows.return_value = []
         
         # Mock system config
-        mock_system_config = MagicMock()
-        mock_system_config.address = "192.168.1.100"
-        mock_system_config.language = "en"
-        mock_system_config.units = "metric"
-        mock_system_config.is_metric.return_value = True
-        mock_system_config.get_location_coordinates.return_value = (52.0, 4.0)
+        mock_system_config = NS(
+            address="192.168.1.100",
+            language="en",
+            units="metric",
+            is_metric=lambda: True,
+            get_location_coordinates=lambda: (52.0, 4.0),
+        )
         
         client.system.get_system_config.return_value = mock_system_config
         
         return client
     
-    @patch('homey_mcp.tools.prompts.ensure_client')
-    async def test_get_prompt_context_success(self, mock_ensure_client, mock_client):
+    async def test_get_prompt_context_success(self, ensure_client_mock, mock_client):
         """Test successful prompt context generation."""
-        mock_ensure_client.return_value = mock_client
+        ensure_client_mock.return_value = mock_client
         
         context = await get_prompt_context()
         
@@ -110,10 +310,9 @@ class TestGetPromptContext:
         assert context.flow_summary["enabled_count"] == 1
         assert isinstance(context.timestamp, str)
     
-    @patch('homey_mcp.tools.prompts.ensure_client')
-    async def test_get_prompt_context_connection_failure(self, mock_ensure_client):
+    async def test_get_prompt_context_connection_failure(self, ensure_client_mock):
         """Test prompt context generation when connection fails."""
-        mock_ensure_client.side_effect = Exception("Connection failed")
+        ensure_client_mock.side_effect = Exception("Connection failed")
         
         context = await get_prompt_context()
         
@@ -122,11 +321,11 @@ class TestGetPromptContext:
         assert context.zone_summary["total_count"] == 0
         assert context.flow_summary["total_count"] == 0
     
-    @patch('homey_mcp.tools.prompts.ensure_client')
-    async def test_get_prompt_context_partial_failure(self, mock_ensure_client, mock_client):
+    async def test_get_prompt_context_partial_failure(self, ensure_client_mock):
         """Test prompt context generation when some API calls fail."""
-        mock_client.devices.get_devices.side_effect = Exception("Device API failed")
-        mock_ensure_client.return_value = mock_client
+        client = AsyncMock()
+        client.devices.get_devices.side_effect = Exception("Device API failed")
+        ensure_client_mock.return_value = client
         
         context = await get_prompt_context()
         
@@ -137,56 +336,34 @@ class TestGetPromptContext:
 class TestDeviceControlAssistant:
     """Test device_control_assistant prompt."""
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_device_control_assistant_success(self, mock_get_context):
+    async def test_device_control_assistant_success(self, mocker):
         """Test successful device control assistant prompt generation."""
-        mock_context = PromptContext(
-            system_info={"connection_status": "connected"},
-            device_summary={
-                "total_count": 10,
-                "online_count": 8,
-                "offline_count": 2,
-                "device_type_count": 3,
-                "capability_count": 15,
-                "sample_device_types": ["light", "sensor", "thermostat"]
-            },
-            zone_summary={"total_count": 4, "zone_names": ["Living Room", "Kitchen", "Bedroom", "Bathroom"]},
-            flow_summary={"total_count": 5, "enabled_count": 4},
-            timestamp="2024-01-01T12:00:00"
-        )
-        mock_get_context.return_value = mock_context
-        
-        result = await prompts_module.device_control_assistant.fn()
-        
-        assert isinstance(result, str)
-        assert "HomeyPro Device Control Assistant" in result
-        assert "**Total Devices**: 10" in result
-        assert "**Online Devices**: 8" in result
-        assert "**Offline Devices**: 2" in result
-        assert "light, sensor, thermostat" in result
-        assert "Living Room, Kitchen, Bedroom, Bathroom" in result
-        assert "2024-01-01T12:00:00" in result
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
+        mock_get_context.return_value = _CTX_DEVICE_CONTROL_OK
+        
+        result = await device_control_assistant.fn()
+        
+        missing = [s for s in EXPECTED_DEVICE_CONTROL if s not in result]
+        assert not missing, missing
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_device_control_assistant_connection_failure(self, mock_get_context):
+    async def test_device_control_assistant_connection_failure(self, mocker):
         """Test device control assistant prompt when connection fails."""
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
         mock_get_context.side_effect = Exception("Connection failed")
         
-        result = await prompts_module.device_control_assistant.fn()
+        result = await device_control_assistant.fn()
         
-        assert isinstance(result, str)
         assert "Error" in result
         assert "system connectivity issues" in result
         assert "Connection failed" in result
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_device_control_assistant_empty_context(self, mock_get_context):
+    async def test_device_control_assistant_empty_context(self, mocker):
         """Test device control assistant prompt with empty context."""
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
         mock_get_context.return_value = PromptContext.empty()
         
-        result = await prompts_module.device_control_assistant.fn()
+        result = await device_control_assistant.fn()
         
-        assert isinstance(result, str)
         assert "**Total Devices**: 0" in result
         assert "**Online Devices**: 0" in result
         assert "No device types detected" in result
@@ -196,53 +373,33 @@ class TestDeviceControlAssistant:
 class TestDeviceTroubleshooting:
     """Test device_troubleshooting prompt."""
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_device_troubleshooting_success(self, mock_get_context):
+    async def test_device_troubleshooting_success(self, mocker):
         """Test successful device troubleshooting prompt generation."""
-        mock_context = PromptContext(
-            system_info={"connection_status": "connected"},
-            device_summary={"total_count": 10, "online_count": 9, "offline_count": 1},
-            zone_summary={"total_count": 3, "zone_names": ["Living Room", "Kitchen", "Bedroom"]},
-            flow_summary={"total_count": 5, "enabled_count": 4},
-            timestamp="2024-01-01T12:00:00"
-        )
-        mock_get_context.return_value = mock_context
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
+        mock_get_context.return_value = _CTX_TROUBLESHOOT_OK
         
-        result = await prompts_module.device_troubleshooting.fn()
+        result = await device_troubleshooting.fn()
         
-        assert isinstance(result, str)
-        assert "HomeyPro Device Troubleshooting Guide" in result
-        assert "Good (90.0% devices online)" in result  # 9/10 = 90%
-        assert "**Total Devices**: 10" in result
-        assert "**Online Devices**: 9" in result
-        assert "**Offline Devices**: 1" in result
-        assert "1 currently offline" in result
+        missing = [s for s in EXPECTED_TROUBLESHOOTING if s not in result]
+        assert not missing, missing
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_device_troubleshooting_critical_health(self, mock_get_context):
+    async def test_device_troubleshooting_critical_health(self, mocker):
         """Test device troubleshooting prompt with critical system health."""
-        mock_context = PromptContext(
-            system_info={"connection_status": "connected"},
-            device_summary={"total_count": 10, "online_count": 5, "offline_count": 5},
-            zone_summary={"total_count": 3, "zone_names": ["Living Room"]},
-            flow_summary={"total_count": 2, "enabled_count": 1},
-            timestamp="2024-01-01T12:00:00"
-        )
-        mock_get_context.return_value = mock_context
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
+        mock_get_context.return_value = _CTX_TROUBLESHOOT_CRITICAL
         
-        result = await prompts_module.device_troubleshooting.fn()
+        result = await device_troubleshooting.fn()
         
         assert "Critical (50.0% devices online)" in result
         assert "5 currently offline" in result
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_device_troubleshooting_connection_failure(self, mock_get_context):
+    async def test_device_troubleshooting_connection_failure(self, mocker):
         """Test device troubleshooting prompt when connection fails."""
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
         mock_get_context.side_effect = Exception("Network error")
         
-        result = await prompts_module.device_troubleshooting.fn()
+        result = await device_troubleshooting.fn()
         
-        assert isinstance(result, str)
         assert "Error" in result
         assert "system connectivity issues" in result
         assert "Network error" in result
@@ -251,54 +408,35 @@ class TestDeviceTroubleshooting:
 class TestDeviceCapabilityExplorer:
     """Test device_capability_explorer prompt."""
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_device_capability_explorer_success(self, mock_get_context):
+    async def test_device_capability_explorer_success(self, mocker):
         """Test successful device capability explorer prompt generation."""
-        mock_context = PromptContext(
-            system_info={"connection_status": "connected"},
-            device_summary={
-                "total_count": 15,
-                "device_type_count": 5,
-                "capability_count": 25,
-                "sample_device_types": ["light", "sensor", "thermostat", "speaker"]
-            },
-            zone_summary={"total_count": 4, "zone_names": ["Living Room", "Kitchen"]},
-            flow_summary={"total_count": 3, "enabled_count": 2},
-            timestamp="2024-01-01T12:00:00"
-        )
-        mock_get_context.return_value = mock_context
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
+        mock_get_context.return_value = _CTX_CAPABILITY_EXPLORER_OK
         
-        result = await prompts_module.device_capability_explorer.fn()
+        result = await device_capability_explorer.fn()
         
-        assert isinstance(result, str)
-        assert "HomeyPro Device Capability Explorer" in result
-        assert "**Total Devices**: 15" in result
-        assert "**Device Types**: 5 different types" in result
-        assert "**Unique Capabilities**: 25 available" in result
-        assert "light, sensor, thermostat, speaker" in result
-        assert "Living Room, Kitchen" in result
+        missing = [s for s in EXPECTED_CAPABILITY_EXPLORER if s not in result]
+        assert not missing, missing
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_device_capability_explorer_no_devices(self, mock_get_context):
+    async def test_device_capability_explorer_no_devices(self, mocker):
         """Test device capability explorer prompt with no devices."""
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
         mock_get_context.return_value = PromptContext.empty()
         
-        result = await prompts_module.device_capability_explorer.fn()
+        result = await device_capability_explorer.fn()
         
-        assert isinstance(result, str)
         assert "**Total Devices**: 0" in result
         assert "**Device Types**: 0 different types" in result
         assert "None detected" in result
         assert "No zones configured" in result
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_device_capability_explorer_connection_failure(self, mock_get_context):
+    async def test_device_capability_explorer_connection_failure(self, mocker):
         """Test device capability explorer prompt when connection fails."""
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
         mock_get_context.side_effect = Exception("API timeout")
         
-        result = await prompts_module.device_capability_explorer.fn()
+        result = await device_capability_explorer.fn()
         
-        assert isinstance(result, str)
         assert "Error" in result
         assert "system connectivity issues" in result
         assert "API timeout" in result
@@ -307,42 +445,23 @@ class TestDeviceCapabilityExplorer:
 class TestFlowCreationAssistant:
     """Test flow_creation_assistant prompt."""
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_flow_creation_assistant_success(self, mock_get_context):
+    async def test_flow_creation_assistant_success(self, mocker):
         """Test successful flow creation assistant prompt generation."""
-        mock_context = PromptContext(
-            system_info={"connection_status": "connected"},
-            device_summary={
-                "total_count": 12,
-                "online_count": 11,
-                "sample_device_types": ["light", "motion_sensor", "thermostat"]
-            },
-            zone_summary={"total_count": 3, "zone_names": ["Living Room", "Kitchen", "Bedroom"]},
-            flow_summary={"total_count": 8, "enabled_count": 6},
-            timestamp="2024-01-01T12:00:00"
-        )
-        mock_get_context.return_value = mock_context
-        
-        result = await prompts_module.flow_creation_assistant.fn()
-        
-        assert isinstance(result, str)
-        assert "HomeyPro Flow Creation Assistant" in result
-        assert "**Total Devices**: 12 (11 online)" in result
-        assert "**Available Zones**: 3 zones" in result
-        assert "**Existing Flows**: 8 (6 enabled)" in result
-        assert "light, motion_sensor, thermostat" in result
-        assert "- Living Room" in result
-        assert "- Kitchen" in result
-        assert "- Bedroom" in result
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
+        mock_get_context.return_value = _CTX_FLOW_CREATION_OK
+        
+        result = await flow_creation_assistant.fn()
+        
+        missing = [s for s in EXPECTED_FLOW_CREATION if s not in result]
+        assert not missing, missing
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_flow_creation_assistant_no_resources(self, mock_get_context):
+    async def test_flow_creation_assistant_no_resources(self, mocker):
         """Test flow creation assistant prompt with minimal resources."""
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
         mock_get_context.return_value = PromptContext.empty()
         
-        result = await prompts_module.flow_creation_assistant.fn()
+        result = await flow_creation_assistant.fn()
         
-        assert isinstance(result, str)
         assert "**Total Devices**: 0 (0 online)" in result
         assert "**Available Zones**: 0 zones" in result
         assert "**Existing Flows**: 0 (0 enabled)" in result
@@ -353,182 +472,98 @@ class TestFlowCreationAssistant:
 class TestFlowOptimization:
     """Test flow_optimization prompt."""
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_flow_optimization_success(self, mock_get_context):
+    async def test_flow_optimization_success(self, mocker):
         """Test successful flow optimization prompt generation."""
-        mock_context = PromptContext(
-            system_info={"connection_status": "connected"},
-            device_summary={"total_count": 20, "online_count": 18},
-            zone_summary={"total_count": 5, "zone_names": ["Living Room", "Kitchen"]},
-            flow_summary={"total_count": 15, "enabled_count": 12},
-            timestamp="2024-01-01T12:00:00"
-        )
-        mock_get_context.return_value = mock_context
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
+        mock_get_context.return_value = _CTX_FLOW_OPTIMIZATION_OK
         
-        result = await prompts_module.flow_optimization.fn()
+        result = await flow_optimization.fn()
         
-        assert isinstance(result, str)
-        assert "HomeyPro Flow Optimization Guide" in result
-        assert "**Total Flows**: 15" in result
-        assert "**Enabled Flows**: 12" in result
-        assert "**Disabled Flows**: 0" in result  # The actual output shows 0, not 3
-        assert "**System Devices**: 20" in result
+        missing = [s for s in EXPECTED_FLOW_OPTIMIZATION if s not in result]
+        assert not missing, missing
 
 
 class TestFlowDebugging:
     """Test flow_debugging prompt."""
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_flow_debugging_success(self, mock_get_context):
+    async def test_flow_debugging_success(self, mocker):
         """Test successful flow debugging prompt generation."""
-        mock_context = PromptContext(
-            system_info={"connection_status": "connected"},
-            device_summary={"total_count": 10, "online_count": 9},
-            zone_summary={"total_count": 3, "zone_names": ["Living Room"]},
-            flow_summary={"total_count": 8, "enabled_count": 6},
-            timestamp="2024-01-01T12:00:00"
-        )
-        mock_get_context.return_value = mock_context
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
+        mock_get_context.return_value = _CTX_FLOW_DEBUGGING_OK
         
-        result = await prompts_module.flow_debugging.fn()
+        result = await flow_debugging.fn()
         
-        assert isinstance(result, str)
-        assert "HomeyPro Flow Debugging Guide" in result
-        assert "6/8 flows enabled" in result
-        assert "Device Health**: 90.0%" in result
-        assert "9/10 devices online" in result
+        missing = [s for s in EXPECTED_FLOW_DEBUGGING if s not in result]
+        assert not missing, missing
 
 
 class TestSystemHealthCheck:
     """Test system_health_check prompt."""
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_system_health_check_success(self, mock_get_context):
+    async def test_system_health_check_success(self, mocker):
         """Test successful system health check prompt generation."""
-        mock_context = PromptContext(
-            system_info={
-                "connection_status": "connected",
-                "address": "192.168.1.100",
-                "language": "en",
-                "units": "metric"
-            },
-            device_summary={"total_count": 25, "online_count": 23, "offline_count": 2},
-            zone_summary={"total_count": 6, "zone_names": ["Living Room", "Kitchen"]},
-            flow_summary={"total_count": 12, "enabled_count": 10},
-            timestamp="2024-01-01T12:00:00"
-        )
-        mock_get_context.return_value = mock_context
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
+        mock_get_context.return_value = _CTX_SYSTEM_HEALTH_OK
         
-        result = await prompts_module.system_health_check.fn()
+        result = await system_health_check.fn()
         
-        assert isinstance(result, str)
-        assert "HomeyPro System Health Check" in result
-        assert "🟡 Good" in result  # 23/25 = 92%
-        assert "**Total Devices**: 25" in result
-        assert "**Online Devices**: 23" in result
-        assert "**Offline Devices**: 2" in result
-        assert "192.168.1.100" in result
+        missing = [s for s in EXPECTED_SYSTEM_HEALTH if s not in result]
+        assert not missing, missing
 
 
 class TestZoneOrganization:
     """Test zone_organization prompt."""
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_zone_organization_success(self, mock_get_context):
+    async def test_zone_organization_success(self, mocker):
         """Test successful zone organization prompt generation."""
-        mock_context = PromptContext(
-            system_info={"connection_status": "connected"},
-            device_summary={"total_count": 30, "online_count": 28},
-            zone_summary={
-                "total_count": 8,
-                "zone_names": ["Living Room", "Kitchen", "Bedroom", "Bathroom", "Office", "Garage"]
-            },
-            flow_summary={"total_count": 15, "enabled_count": 12},
-            timestamp="2024-01-01T12:00:00"
-        )
-        mock_get_context.return_value = mock_context
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
+        mock_get_context.return_value = _CTX_ZONE_ORGANIZATION_OK
         
-        result = await prompts_module.zone_organization.fn()
+        result = await zone_organization.fn()
         
-        assert isinstance(result, str)
-        assert "HomeyPro Zone Organization Guide" in result
-        assert "**Total Zones**: 8" in result
-        assert "**Total Devices**: 30" in result
-        assert "Living Room" in result
-        assert "Kitchen" in result
-        assert "Bedroom" in result
+        missing = [s for s in EXPECTED_ZONE_ORGANIZATION if s not in result]
+        assert not missing, missing
 
 
 class TestPromptIntegration:
     """Integration tests for prompt functionality."""
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_all_prompts_handle_empty_context(self, mock_get_context):
+    def test_prompt_return_types_are_str(self):
+        """Test that every prompt declares a str return type."""
+        for prompt_func in ALL_PROMPT_FNS:
+            assert typing.get_type_hints(prompt_func).get("return") is str
+    
+    async def test_all_prompts_handle_empty_context(self, mocker):
         """Test that all prompts handle empty context gracefully."""
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
         mock_get_context.return_value = PromptContext.empty()
         
-        prompts = [
-            prompts_module.device_control_assistant.fn,
-            prompts_module.device_troubleshooting.fn,
-            prompts_module.device_capability_explorer.fn,
-            prompts_module.flow_creation_assistant.fn,
-            prompts_module.flow_optimization.fn,
-            prompts_module.flow_debugging.fn,
-            prompts_module.system_health_check.fn,
-            prompts_module.zone_organization.fn,
-        ]
-        
-        for prompt_func in prompts:
+        for prompt_func in ALL_PROMPT_FNS:
             result = await prompt_func()
-            assert isinstance(result, str)
             assert len(result) > 0
             # Should not contain error messages when context is empty but valid
             assert "Error" not in result or "connectivity issues" not in result
     
-    @patch('homey_mcp.tools.prompts.get_prompt_context')
-    async def test_all_prompts_handle_exceptions(self, mock_get_context):
+    async def test_all_prompts_handle_exceptions(self, mocker):
         """Test that all prompts handle exceptions gracefully."""
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
         mock_get_context.side_effect = Exception("Test exception")
         
-        prompts = [
-            prompts_module.device_control_assistant.fn,
-            prompts_module.device_troubleshooting.fn,
-            prompts_module.device_capability_explorer.fn,
-            prompts_module.flow_creation_assistant.fn,
-            prompts_module.flow_optimization.fn,
-            prompts_module.flow_debugging.fn,
-            prompts_module.system_health_check.fn,
-            prompts_module.zone_organization.fn,
-        ]
-        
-        for prompt_func in prompts:
+        for prompt_func in ALL_PROMPT_FNS:
             result = await prompt_func()
-            assert isinstance(result, str)
             assert len(result) > 0
             assert "Error" in result
             assert "Test exception" in result
     
-    async def test_prompt_arguments_parameter(self):
+    async def test_prompt_arguments_parameter(self, mocker):
         """Test that prompts accept optional arguments parameter."""
-        # All prompts should accept arguments parameter without error
-        prompts = [
-            prompts_module.device_control_assistant.fn,
-            prompts_module.device_troubleshooting.fn,
-            prompts_module.device_capability_explorer.fn,
-            prompts_module.flow_creation_assistant.fn,
-            prompts_module.flow_optimization.fn,
-            prompts_module.flow_debugging.fn,
-            prompts_module.system_health_check.fn,
-            prompts_module.zone_organization.fn,
-        ]
+        mock_get_context = mocker.patch('homey_mcp.tools.prompts.get_prompt_context')
+        mock_get_context.return_value = PromptContext.empty()
         
+        # All prompts should accept arguments parameter without error
         test_args = {"test": "value"}
         
-        with patch('homey_mcp.tools.prompts.get_prompt_context') as mock_get_context:
-            mock_get_context.return_value = PromptContext.empty()
-            
-            for prompt_func in prompts:
-                # Should not raise exception when called with arguments
-                result = await prompt_func(test_args)
-                assert isinstance(result, str)
-                assert len(result) > 0
\ No newline at end of file
+        for prompt_func in ALL_PROMPT_FNS:
+            # Should not raise exception when called with arguments
+            result = await prompt_func(test_args)
+            assert len(result) > 0
\ No newline at end of file